@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kategori ve Zoom Seviyesine Göre Yoğunluk Rasterları Oluşturma
+
+Her kategori için, web-mercator karo çözünürlüğünde çok seviyeli yoğunluk
+ızgaraları üretir. En ince zoom'da 2B histogram hesaplanır, üst seviyeler
+2x2 hücre toplanarak türetilir. Her zoom seviyesinin boş olmayan karoları
+alt alta tek bir atlas görüntüsüne dizilir ve sayılar uint8/uint16 olarak
+gri tonlamalı PNG (veya ham ikili) dosyaya yazılır; manifest ile birlikte
+tarayıcı ısı katmanını birkaç küçük görüntü olarak yükler.
+"""
+
+import json
+import math
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+
+from find_duplicates import load_all_pois
+
+# Dosya yolları
+BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+OUTPUT_DIR = os.path.join(BASE_DIR, "density")
+
+# Raster ayarları
+CATEGORIES = ['eglence', 'kultur-sanat', 'yemek', 'doga']
+MIN_ZOOM = 10
+MAX_ZOOM = 16
+CELLS_PER_TILE = 32  # 256px karo başına 8px'lik hücreler
+RASTER_FORMAT = 'png'  # 'png' veya 'raw'
+
+
+def lonlat_to_world(lon, lat):
+    """Boylam/enlemi [0, 1) aralığında web-mercator dünya koordinatına çevirir"""
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def build_histograms(points, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, cells_per_tile=CELLS_PER_TILE):
+    """
+    points: (dünya x, dünya y) listesi
+    {zoom: Counter((hücre x, hücre y) -> sayı)} döndürür
+    """
+    scale = (2 ** max_zoom) * cells_per_tile
+    histograms = {
+        max_zoom: Counter((int(x * scale), int(y * scale)) for x, y in points)
+    }
+
+    # Üst seviyeler: 2x2 hücreleri topla
+    for zoom in range(max_zoom - 1, min_zoom - 1, -1):
+        parent = Counter()
+        for (cx, cy), count in histograms[zoom + 1].items():
+            parent[(cx >> 1, cy >> 1)] += count
+        histograms[zoom] = parent
+
+    return histograms
+
+
+def _png_bytes(width, height, values):
+    """Gri tonlamalı PNG (renk tipi 0, 8 veya 16 bit) oluşturur"""
+    bit_depth = 8 if values.typecode == 'B' else 16
+    samples = array(values.typecode, values)
+    if bit_depth == 16 and sys.byteorder == 'little':
+        samples.byteswap()  # PNG örnekleri big-endian
+    data = samples.tobytes()
+
+    row_size = width * samples.itemsize
+    raw = bytearray()
+    for row in range(height):
+        raw.append(0)  # filtre: yok
+        raw.extend(data[row * row_size:(row + 1) * row_size])
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, bit_depth, 0, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(bytes(raw), 9))
+            + chunk(b'IEND', b''))
+
+
+def rasterize(histogram, cells_per_tile=CELLS_PER_TILE):
+    """
+    Histogramı boş olmayan karolardan oluşan bir atlasa çevirir.
+    Karo i, atlasta [i * cells_per_tile, (i + 1) * cells_per_tile) satırlarındadır.
+    (karo listesi, değerler dizisi, maksimum) döndürür.
+    """
+    tiles = sorted({(cx // cells_per_tile, cy // cells_per_tile) for cx, cy in histogram})
+    tile_row = {tile: i for i, tile in enumerate(tiles)}
+    max_count = max(histogram.values())
+
+    typecode = 'B' if max_count <= 0xff else 'H'
+    limit = 0xff if typecode == 'B' else 0xffff
+    size = len(tiles) * cells_per_tile * cells_per_tile
+    values = array(typecode, bytes(size * array(typecode).itemsize))
+    for (cx, cy), count in histogram.items():
+        tx, ty = cx // cells_per_tile, cy // cells_per_tile
+        row = tile_row[(tx, ty)] * cells_per_tile + (cy - ty * cells_per_tile)
+        values[row * cells_per_tile + (cx - tx * cells_per_tile)] = min(count, limit)
+
+    return [list(tile) for tile in tiles], values, max_count
+
+
+def write_raster(output_dir, name, width, height, values, raster_format=RASTER_FORMAT):
+    """Raster'ı PNG veya ham (little-endian) dosya olarak yazar"""
+    bit_depth = 8 if values.typecode == 'B' else 16
+    if raster_format == 'png':
+        filename = f"{name}.png"
+        data = _png_bytes(width, height, values)
+    else:
+        filename = f"{name}.bin"
+        if sys.byteorder != 'little':
+            values = array(values.typecode, values)
+            values.byteswap()
+        data = values.tobytes()
+
+    with open(os.path.join(output_dir, filename), 'wb') as f:
+        f.write(data)
+    return filename, f"uint{bit_depth}"
+
+
+def build_density_rasters(pois, output_dir, categories=CATEGORIES, min_zoom=MIN_ZOOM,
+                          max_zoom=MAX_ZOOM, cells_per_tile=CELLS_PER_TILE,
+                          raster_format=RASTER_FORMAT):
+    """Tüm kategoriler için rasterları ve manifest'i yazar"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    by_category = {category: [] for category in categories}
+    for poi in pois:
+        if poi['source_category'] in by_category:
+            by_category[poi['source_category']].append(lonlat_to_world(poi['lon'], poi['lat']))
+
+    manifest = {
+        'version': 1,
+        'format': raster_format,
+        'cells_per_tile': cells_per_tile,
+        'min_zoom': min_zoom,
+        'max_zoom': max_zoom,
+        'layers': {}
+    }
+
+    for category, points in by_category.items():
+        if not points:
+            continue
+
+        layers = []
+        histograms = build_histograms(points, min_zoom, max_zoom, cells_per_tile)
+        for zoom in range(min_zoom, max_zoom + 1):
+            tiles, values, max_count = rasterize(histograms[zoom], cells_per_tile)
+            filename, dtype = write_raster(
+                output_dir, f"{category}_z{zoom}", cells_per_tile,
+                len(tiles) * cells_per_tile, values, raster_format
+            )
+            layers.append({
+                'zoom': zoom,
+                'file': filename,
+                'dtype': dtype,
+                'max_count': max_count,
+                'tiles': tiles
+            })
+
+        manifest['layers'][category] = layers
+        print(f"  ✓ {category}: {len(points)} POI, {len(layers)} zoom seviyesi")
+
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return manifest_path
+
+
+def main():
+    print("=" * 70)
+    print("YOĞUNLUK RASTERLARI")
+    print("=" * 70)
+
+    print("\n1. POI'ler yükleniyor...")
+    pois = load_all_pois(BASE_DIR, CATEGORIES)
+    print(f"\n✓ Toplam {len(pois)} POI yüklendi")
+
+    print(f"\n2. Rasterlar oluşturuluyor (zoom {MIN_ZOOM}-{MAX_ZOOM})...")
+    manifest_path = build_density_rasters(pois, OUTPUT_DIR)
+    print(f"\n💾 Manifest kaydedildi: {manifest_path}")
+
+    print("\n" + "=" * 70)
+    print("✓ İŞLEM TAMAMLANDI!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
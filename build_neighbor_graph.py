@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+POI Komşuluk Grafiği Oluşturma
+
+Her POI için, her kategorideki en yakın k komşuyu (yarıçap sınırı içinde)
+önceden hesaplar ve CSR formatında kaydeder:
+  - offsets:   (POI sayısı * kategori sayısı + 1) adet uint32
+  - neighbors: komşu POI sıra numaraları (uint32)
+  - distances: kuantize edilmiş mesafeler (uint16, 0..radius)
+"Yakındakiler" sorgusu böylece O(k) okumaya dönüşür.
+"""
+
+import heapq
+import json
+import os
+import sys
+from array import array
+
+from find_duplicates import load_all_pois
+from spatial_index import GridIndex
+
+# Dosya yolları
+BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+GRAPH_BIN = "poi_neighbors.bin"
+GRAPH_MANIFEST = "poi_neighbors.json"
+
+# Grafik ayarları
+CATEGORIES = ['eglence', 'kultur-sanat', 'yemek', 'doga']
+NEIGHBOR_K = 10
+NEIGHBOR_RADIUS_M = 1000
+DISTANCE_LEVELS = 65535
+
+
+def _to_little_endian(arr):
+    """Dosyaya yazmadan önce byte sırasını sabitle"""
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+def build_neighbor_graph(pois, categories=CATEGORIES, k=NEIGHBOR_K, radius_m=NEIGHBOR_RADIUS_M):
+    """
+    pois: load_all_pois çıktısı (kategori sırasına göre dizili)
+    (offsets, neighbors, distances) dizilerini döndürür.
+    Satır (i, c) = i * len(categories) + c
+    """
+    category_slot = {category: c for c, category in enumerate(categories)}
+    num_categories = len(categories)
+
+    index = GridIndex(radius_m)
+    for i, poi in enumerate(pois):
+        index.insert(i, poi['lon'], poi['lat'])
+
+    offsets = array('I', [0])
+    neighbors = array('I')
+    distances = array('H')
+    scale = DISTANCE_LEVELS / radius_m
+
+    total = len(pois)
+    for i, poi in enumerate(pois):
+        if (i + 1) % 1000 == 0:
+            print(f"İlerleme: {i+1}/{total} POI işlendi...")
+
+        # Yarıçap içindekileri kategorilere ayır
+        by_category = [[] for _ in range(num_categories)]
+        for j, distance in index.query_radius(poi['lon'], poi['lat'], radius_m):
+            if j == i:
+                continue
+            slot = category_slot.get(pois[j]['source_category'])
+            if slot is not None:
+                by_category[slot].append((distance, j))
+
+        for candidates in by_category:
+            for distance, j in heapq.nsmallest(k, candidates):
+                neighbors.append(j)
+                distances.append(min(DISTANCE_LEVELS, round(distance * scale)))
+            offsets.append(len(neighbors))
+
+    return offsets, neighbors, distances
+
+
+def save_neighbor_graph(output_dir, pois, offsets, neighbors, distances,
+                        categories=CATEGORIES, k=NEIGHBOR_K, radius_m=NEIGHBOR_RADIUS_M):
+    """İkili veriyi ve manifest'i kaydet"""
+    bin_path = os.path.join(output_dir, GRAPH_BIN)
+    sections = {}
+    position = 0
+    with open(bin_path, 'wb') as f:
+        for name, arr in (('offsets', offsets), ('neighbors', neighbors), ('distances', distances)):
+            data = _to_little_endian(arr).tobytes()
+            sections[name] = {
+                'byte_offset': position,
+                'count': len(arr),
+                'dtype': 'uint16' if arr.typecode == 'H' else 'uint32'
+            }
+            f.write(data)
+            position += len(data)
+
+    # Kategori başına sıra numarası aralıkları
+    category_ranges = {}
+    for ordinal, poi in enumerate(pois):
+        start_end = category_ranges.setdefault(poi['source_category'], [ordinal, ordinal])
+        start_end[1] = ordinal + 1
+
+    manifest = {
+        'version': 1,
+        'file': GRAPH_BIN,
+        'k': k,
+        'radius_m': radius_m,
+        'distance_scale': radius_m / DISTANCE_LEVELS,
+        'categories': categories,
+        'category_ranges': category_ranges,
+        'ids': [str(poi['id']) for poi in pois],
+        'sections': sections
+    }
+    manifest_path = os.path.join(output_dir, GRAPH_MANIFEST)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    return bin_path, manifest_path
+
+
+class NeighborGraph:
+    """Kaydedilmiş komşuluk grafiğini okur"""
+
+    def __init__(self, manifest, offsets, neighbors, distances):
+        self.manifest = manifest
+        self.categories = manifest['categories']
+        self.ids = manifest['ids']
+        self.distance_scale = manifest['distance_scale']
+        self.offsets = offsets
+        self.neighbors_arr = neighbors
+        self.distances = distances
+        self.ordinal_of = {poi_id: i for i, poi_id in enumerate(self.ids)}
+        self.category_slot = {category: c for c, category in enumerate(self.categories)}
+
+    @classmethod
+    def load(cls, base_dir=BASE_DIR):
+        """Manifest ve ikili dosyadan grafiği yükle"""
+        with open(os.path.join(base_dir, GRAPH_MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        with open(os.path.join(base_dir, manifest['file']), 'rb') as f:
+            raw = f.read()
+
+        loaded = {}
+        for name, section in manifest['sections'].items():
+            arr = array('H' if section['dtype'] == 'uint16' else 'I')
+            start = section['byte_offset']
+            arr.frombytes(raw[start:start + section['count'] * arr.itemsize])
+            if sys.byteorder != 'little':
+                arr.byteswap()
+            loaded[name] = arr
+
+        return cls(manifest, loaded['offsets'], loaded['neighbors'], loaded['distances'])
+
+    def neighbors_of(self, ordinal, category):
+        """Sıra numarasına göre (komşu sıra no, mesafe metre) listesi"""
+        row = ordinal * len(self.categories) + self.category_slot[category]
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return [
+            (self.neighbors_arr[n], self.distances[n] * self.distance_scale)
+            for n in range(start, end)
+        ]
+
+    def neighbors(self, poi_id, category=None):
+        """
+        POI id'sine göre (komşu id, mesafe metre) listesi.
+        category verilmezse tüm kategoriler mesafeye göre birleştirilir.
+        """
+        ordinal = self.ordinal_of.get(str(poi_id))
+        if ordinal is None:
+            return []
+        if category is not None:
+            return [(self.ids[j], d) for j, d in self.neighbors_of(ordinal, category)]
+
+        merged = heapq.merge(
+            *(self.neighbors_of(ordinal, cat) for cat in self.categories),
+            key=lambda item: item[1]
+        )
+        return [(self.ids[j], d) for j, d in merged]
+
+
+def main():
+    print("=" * 70)
+    print("POI KOMŞULUK GRAFİĞİ")
+    print("=" * 70)
+
+    print("\n1. POI'ler yükleniyor...")
+    pois = load_all_pois(BASE_DIR, CATEGORIES)
+    print(f"\n✓ Toplam {len(pois)} POI yüklendi")
+
+    print(f"\n2. Komşular hesaplanıyor (k={NEIGHBOR_K}, yarıçap={NEIGHBOR_RADIUS_M}m)...")
+    offsets, neighbors, distances = build_neighbor_graph(pois)
+    print(f"  ✓ {len(neighbors)} kenar")
+
+    print("\n3. Kaydediliyor...")
+    bin_path, manifest_path = save_neighbor_graph(BASE_DIR, pois, offsets, neighbors, distances)
+    print(f"  ✓ {bin_path} ({os.path.getsize(bin_path)} byte)")
+    print(f"  ✓ {manifest_path}")
+
+    print("\n" + "=" * 70)
+    print("✓ İŞLEM TAMAMLANDI!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
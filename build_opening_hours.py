@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Haftalık Çalışma Saatleri Bit Dizileri Oluşturma
+
+workday_timing ve closed_on alanları bir kez ayrıştırılıp her POI için
+15 dakika çözünürlüklü (7 * 96 = 672 slot) haftalık bit dizisine çevrilir.
+Bit dizileri kategori başına paketlenmiş uint32 dizisi olarak kaydedilir;
+"şu an açık" gibi filtreler tüm veri üzerinde tek bir bitsel AND işlemine dönüşür.
+"""
+
+import json
+import os
+import re
+import sys
+from array import array
+
+from clean_duplicates import normalize_name
+
+# Dosya yolları
+BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+MANIFEST_FILE = "opening_hours.json"
+
+CATEGORIES = ['eglence', 'kultur-sanat', 'yemek', 'doga']
+
+# Bit dizisi düzeni: gün 0 = Pazartesi, slot = gün * 96 + dakika // 15
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * SLOTS_PER_DAY
+WORDS_PER_POI = WEEK_SLOTS // 32
+BYTES_PER_POI = WEEK_SLOTS // 8
+WEEK_MASK = (1 << WEEK_SLOTS) - 1
+
+# Ayrıştırma durumu
+STATUS_MISSING = 0
+STATUS_PARSED = 1
+STATUS_UNPARSEABLE = 2
+
+DAY_NAMES = {
+    'pazartesi': 0, 'sali': 1, 'carsamba': 2, 'persembe': 3,
+    'cuma': 4, 'cumartesi': 5, 'pazar': 6,
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+ALWAYS_OPEN = {'24 saat acik', '24 saat', 'her zaman acik', 'open 24 hours', '24 hours'}
+TIME_RANGE = re.compile(r'^(\d{1,2})[:.](\d{2})\s*[-–]\s*(\d{1,2})[:.](\d{2})$')
+
+
+def _slot(minute_of_week):
+    return minute_of_week // SLOT_MINUTES
+
+
+def _interval_bits(start_slot, end_slot):
+    """[start_slot, end_slot) aralığının bitleri (hafta sonunda başa sarar)"""
+    if end_slot <= start_slot:
+        return 0
+    length = min(end_slot - start_slot, WEEK_SLOTS)
+    bits = ((1 << length) - 1) << start_slot
+    return (bits | (bits >> WEEK_SLOTS)) & WEEK_MASK
+
+
+def parse_closed_days(closed_on):
+    """closed_on değerini gün numaraları kümesine çevirir; tanınmayan gün varsa None"""
+    if not closed_on:
+        return set()
+    if isinstance(closed_on, str):
+        closed_on = re.split(r'[,;/]', closed_on)
+
+    days = set()
+    for name in closed_on:
+        key = normalize_name(str(name))
+        if not key:
+            continue
+        if key not in DAY_NAMES:
+            return None
+        days.add(DAY_NAMES[key])
+    return days
+
+
+def parse_opening_hours(workday_timing, closed_on=None):
+    """
+    (bit dizisi, durum) döndürür.
+    workday_timing: "09:00-22:00", "10:00-02:00" (gece yarısını aşan), "24 saat acik"
+    veya virgülle ayrılmış birden fazla aralık. Aralıklar kapalı olmayan her gün uygulanır.
+    """
+    if workday_timing is None or not str(workday_timing).strip():
+        return 0, STATUS_MISSING
+
+    closed_days = parse_closed_days(closed_on)
+    if closed_days is None:
+        return 0, STATUS_UNPARSEABLE
+
+    text = str(workday_timing).strip()
+    if normalize_name(text) in ALWAYS_OPEN:
+        ranges = [(0, 24 * 60)]
+    else:
+        ranges = []
+        for part in re.split(r'[,;]', text):
+            match = TIME_RANGE.match(part.strip())
+            if not match:
+                return 0, STATUS_UNPARSEABLE
+            h1, m1, h2, m2 = (int(value) for value in match.groups())
+            if h1 > 24 or h2 > 24 or m1 > 59 or m2 > 59:
+                return 0, STATUS_UNPARSEABLE
+            # Sadece 24:00 geçerli; 24:30 gibi değerler ertesi güne taşardı
+            if (h1 == 24 and m1) or (h2 == 24 and m2):
+                return 0, STATUS_UNPARSEABLE
+            start, end = h1 * 60 + m1, h2 * 60 + m2
+            # Gece yarısını aşan (veya 00:00'da biten) aralık ertesi güne taşar
+            if end <= start:
+                end += 24 * 60
+            ranges.append((start, end))
+
+    bits = 0
+    for day in range(7):
+        if day in closed_days:
+            continue
+        base = day * 24 * 60
+        for start, end in ranges:
+            bits |= _interval_bits(_slot(base + start), _slot(base + end + SLOT_MINUTES - 1))
+    return bits, STATUS_PARSED
+
+
+def time_window_mask(day, start_minute, end_minute=None):
+    """
+    Haftalık zaman penceresi maskesi.
+    day: 0 = Pazartesi; end_minute verilmezse tek bir an (o anın slotu)
+    """
+    start = day * 24 * 60 + start_minute
+    end = start + 1 if end_minute is None else day * 24 * 60 + end_minute
+    if end <= start:
+        end += 24 * 60
+    return _interval_bits(_slot(start), _slot(end + SLOT_MINUTES - 1))
+
+
+def pack_bitsets(bitsets):
+    """Bit dizilerini little-endian uint32 dizisine paketler"""
+    data = b''.join(bits.to_bytes(BYTES_PER_POI, 'little') for bits in bitsets)
+    words = array('I')
+    words.frombytes(data)
+    if sys.byteorder != 'little':
+        words.byteswap()
+    return words
+
+
+def build_opening_hours(features):
+    """
+    Feature listesinden (id listesi, bit dizileri, durum listesi, çözülemeyenler) üretir
+    """
+    ids, bitsets, statuses, unparseable = [], [], [], []
+    for feature in features:
+        props = feature['properties']
+        bits, status = parse_opening_hours(props.get('workday_timing'), props.get('closed_on'))
+        ids.append(str(props.get('id')))
+        bitsets.append(bits)
+        statuses.append(status)
+        if status == STATUS_UNPARSEABLE:
+            unparseable.append({
+                'id': str(props.get('id')),
+                'name': props.get('name', ''),
+                'workday_timing': props.get('workday_timing'),
+                'closed_on': props.get('closed_on')
+            })
+    return ids, bitsets, statuses, unparseable
+
+
+class OpeningHoursIndex:
+    """Bir kategorinin paketlenmiş bit dizileri üzerinde zaman penceresi filtresi"""
+
+    def __init__(self, ids, statuses, data):
+        self.ids = ids
+        self.statuses = statuses
+        # Tüm veri tek bir büyük tamsayı: POI i, [i * 672, (i + 1) * 672) bitlerinde
+        self.count = len(ids)
+        self.data = int.from_bytes(data, 'little')
+
+    @classmethod
+    def load(cls, category, base_dir=BASE_DIR):
+        with open(os.path.join(base_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        entry = manifest['categories'][category]
+        with open(os.path.join(base_dir, entry['file']), 'rb') as f:
+            data = f.read()
+        return cls(entry['ids'], entry['status'], data)
+
+    def _repeat(self, mask):
+        """Maskeyi her POI satırına kopyala"""
+        return int.from_bytes(mask.to_bytes(BYTES_PER_POI, 'little') * self.count, 'little')
+
+    def _nonzero_rows(self, value):
+        raw = value.to_bytes(self.count * BYTES_PER_POI, 'little')
+        empty = bytes(BYTES_PER_POI)
+        return [
+            i for i in range(self.count)
+            if raw[i * BYTES_PER_POI:(i + 1) * BYTES_PER_POI] != empty
+        ]
+
+    def open_during(self, mask, whole_window=False):
+        """
+        Pencerede açık olan POI id'leri.
+        whole_window=True ise pencerenin tamamında açık olanlar döner.
+        """
+        repeated = self._repeat(mask)
+        hits = self.data & repeated
+        if not whole_window:
+            return [self.ids[i] for i in self._nonzero_rows(hits)]
+
+        # Eksik slotu olan satırlar elenir; bilinmeyen saatler dahil edilmez
+        missing = set(self._nonzero_rows(hits ^ repeated))
+        return [
+            poi_id for i, poi_id in enumerate(self.ids)
+            if i not in missing and self.statuses[i] == STATUS_PARSED
+        ]
+
+
+def main():
+    print("=" * 70)
+    print("ÇALIŞMA SAATLERİ BİT DİZİLERİ")
+    print("=" * 70)
+
+    manifest = {
+        'version': 1,
+        'slot_minutes': SLOT_MINUTES,
+        'slots': WEEK_SLOTS,
+        'words_per_poi': WORDS_PER_POI,
+        'week_start': 'Pazartesi',
+        'categories': {},
+        'unparseable': []
+    }
+
+    for category in CATEGORIES:
+        filepath = os.path.join(BASE_DIR, f"{category}.geojson")
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                features = json.load(f).get('features', [])
+        except Exception as e:
+            print(f"✗ {category}: HATA - {str(e)}")
+            continue
+
+        ids, bitsets, statuses, unparseable = build_opening_hours(features)
+        filename = f"{category}_hours.bin"
+        with open(os.path.join(BASE_DIR, filename), 'wb') as f:
+            f.write(pack_bitsets(bitsets).tobytes())
+
+        manifest['categories'][category] = {'file': filename, 'ids': ids, 'status': statuses}
+        for item in unparseable:
+            item['category'] = category
+        manifest['unparseable'].extend(unparseable)
+
+        parsed = statuses.count(STATUS_PARSED)
+        print(f"✓ {category}: {parsed}/{len(ids)} POI ayrıştırıldı, {len(unparseable)} çözülemedi")
+
+    with open(os.path.join(BASE_DIR, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    if manifest['unparseable']:
+        print(f"\n⚠️  Çözülemeyen Çalışma Saatleri ({len(manifest['unparseable'])}):")
+        print("-" * 70)
+        for item in manifest['unparseable'][:20]:
+            print(f"  - {item['name']} ({item['category']}): "
+                  f"{item['workday_timing']!r} / {item['closed_on']!r}")
+
+    print("\n" + "=" * 70)
+    print("✓ İŞLEM TAMAMLANDI!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
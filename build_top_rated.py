@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Karo ve Kategori Bazında Önceden Sıralanmış En İyi K Listesi Oluşturma
+
+rating ve reviews_count alanlarından yorum sayısını dikkate alan bir
+Bayes ortalaması hesaplanır:
+    skor = (v / (v + m)) * R + (m / (v + m)) * C
+    R: POI puanı, v: yorum sayısı, C: önsel ortalama, m: önsel ağırlık
+Her kategori için, birkaç zoom seviyesindeki her web-mercator karosuna ait
+en iyi K POI skora göre sıralı olarak kaydedilir; en ince seviyede ise
+karonun tüm POI'leri sıralı tutulur. Bir görünüm alanı için sıralı sorgu,
+tamamen görünüm içindeki karoların kısa listeleri ile kenar karoların
+(en ince seviyede süzülmüş) tam listelerinin birleştirilmesine dönüşür.
+"""
+
+import heapq
+import itertools
+import json
+import math
+import os
+from collections import defaultdict
+
+from build_density_rasters import lonlat_to_world
+
+# Dosya yolları
+BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+OUTPUT_FILE = "top_rated.json"
+
+CATEGORIES = ['eglence', 'kultur-sanat', 'yemek', 'doga']
+
+# Sıralama ayarları
+TOP_K = 20
+ZOOMS = [12, 14, 16]  # En ince seviyede karo listeleri kesilmez
+PRIOR_MEAN = None    # None ise kategorinin ortalama puanı kullanılır
+PRIOR_WEIGHT = 50    # Önsel ortalamanın kaç yoruma denk sayılacağı
+
+
+def _to_number(value):
+    """Sayısal alanı float'a çevirir; geçersizse None"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def bayesian_score(rating, reviews_count, prior_mean, prior_weight=PRIOR_WEIGHT):
+    """Yorum sayısını dikkate alan Bayes ortalaması"""
+    votes = max(reviews_count or 0, 0)
+    if votes + prior_weight <= 0:
+        return prior_mean
+    return (votes * rating + prior_weight * prior_mean) / (votes + prior_weight)
+
+
+def load_rated_pois(category, base_dir=BASE_DIR):
+    """Puanı olan POI'leri (id, isim, boylam, enlem, puan, yorum sayısı) olarak yükle"""
+    filepath = os.path.join(base_dir, f"{category}.geojson")
+    with open(filepath, 'r', encoding='utf-8') as f:
+        features = json.load(f).get('features', [])
+
+    rated = []
+    for feature in features:
+        props = feature['properties']
+        rating = _to_number(props.get('rating'))
+        if rating is None:
+            continue
+        lon, lat = feature['geometry']['coordinates'][:2]
+        rated.append({
+            'id': str(props.get('id')),
+            'name': props.get('name', ''),
+            'lon': lon,
+            'lat': lat,
+            'rating': rating,
+            'reviews_count': int(_to_number(props.get('reviews_count')) or 0)
+        })
+    return rated
+
+
+def build_top_lists(pois, zooms=ZOOMS, k=TOP_K, prior_mean=PRIOR_MEAN, prior_weight=PRIOR_WEIGHT):
+    """
+    Bir kategorinin POI'leri için (kategori listesi, {zoom: {"x/y": liste}}, kullanılan önsel) döndürür.
+    Liste öğeleri: [id, skor, boylam, enlem], skora göre azalan sırada.
+    En ince zoom'daki karo listeleri k ile kesilmez (kenar karoları için gerekli).
+    """
+    if prior_mean is None:
+        prior_mean = sum(poi['rating'] for poi in pois) / len(pois) if pois else 0.0
+
+    entries = []
+    for poi in pois:
+        score = bayesian_score(poi['rating'], poi['reviews_count'], prior_mean, prior_weight)
+        entries.append((round(score, 4), poi['id'], poi['lon'], poi['lat']))
+
+    # Skor eşitliğinde id'ye göre sabit sıralama
+    def top(items, limit=k):
+        if limit is None:
+            ranked = sorted(items, key=lambda e: (-e[0], e[1]))
+        else:
+            ranked = heapq.nsmallest(limit, items, key=lambda e: (-e[0], e[1]))
+        return [[poi_id, score, lon, lat] for score, poi_id, lon, lat in ranked]
+
+    finest = max(zooms)
+    by_zoom = {}
+    for zoom in zooms:
+        tiles = defaultdict(list)
+        scale = 2 ** zoom
+        for entry in entries:
+            x, y = lonlat_to_world(entry[2], entry[3])
+            tiles[f"{int(x * scale)}/{int(y * scale)}"].append(entry)
+        limit = None if zoom == finest else k
+        by_zoom[str(zoom)] = {tile: top(items, limit) for tile, items in tiles.items()}
+
+    return top(entries), by_zoom, prior_mean
+
+
+class TopRatedIndex:
+    """Kaydedilmiş en iyi K listeleri üzerinde görünüm alanı sorgusu"""
+
+    # Karo görünümün bu kadar (dünya koordinatı) içindeyse "tamamen içeride" sayılır;
+    # sınırdaki yuvarlama farkları kenar karo yoluna düşer
+    INSIDE_MARGIN = 1e-12
+
+    def __init__(self, data):
+        self.data = data
+        self.k = data['k']
+        self.zooms = sorted(int(zoom) for zoom in data['zooms'])
+
+    @classmethod
+    def load(cls, base_dir=BASE_DIR):
+        with open(os.path.join(base_dir, OUTPUT_FILE), 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _start_level(self, bounds, zoom):
+        """Karoları görünümden küçük olan en kaba kayıtlı seviyenin sırası"""
+        if zoom is not None:
+            finer = [i for i, level in enumerate(self.zooms) if level >= zoom]
+            return finer[0] if finer else len(self.zooms) - 1
+
+        min_x, min_y, max_x, max_y = bounds
+        span = min(max_x - min_x, max_y - min_y)
+        for i, level in enumerate(self.zooms):
+            if 1.0 / 2 ** level <= span:
+                return i
+        return len(self.zooms) - 1
+
+    def _collect(self, tiles, bbox, bounds, position, tx, ty, k, lists):
+        """
+        Bir karonun görünüme düşen kısmı için sıralı listeleri toplar.
+        Tamamen içerideki karonun ilk k öğesi yeterlidir; kenar karolar bir
+        sonraki seviyeye bölünür, en ince seviyede tam liste süzülür.
+        """
+        level = self.zooms[position]
+        items = tiles[position].get(f"{tx}/{ty}")
+        if not items:
+            return
+
+        scale = 2 ** level
+        min_x, min_y, max_x, max_y = bounds
+        margin = self.INSIDE_MARGIN
+        if (tx / scale > min_x + margin and (tx + 1) / scale < max_x - margin
+                and ty / scale > min_y + margin and (ty + 1) / scale < max_y - margin):
+            lists.append(items[:k])
+            return
+
+        if position == len(self.zooms) - 1:
+            west, south, east, north = bbox
+            lists.append([
+                item for item in items
+                if west <= item[2] <= east and south <= item[3] <= north
+            ])
+            return
+
+        child_scale = 2 ** self.zooms[position + 1]
+        factor = child_scale // scale
+        for cx in range(max(tx * factor, int(min_x * child_scale)),
+                        min((tx + 1) * factor - 1, int(max_x * child_scale)) + 1):
+            for cy in range(max(ty * factor, int(min_y * child_scale)),
+                            min((ty + 1) * factor - 1, int(max_y * child_scale)) + 1):
+                self._collect(tiles, bbox, bounds, position + 1, cx, cy, k, lists)
+
+    def top(self, category, bbox=None, zoom=None, k=10):
+        """
+        bbox: (batı, güney, doğu, kuzey). Verilmezse kategori listesi döner.
+        zoom: görünüm zoom'u; karoları bu zoom'unkilerden büyük olmayan ilk kayıtlı
+        seviyeden başlanır. Verilmezse seviye bbox boyutundan seçilir.
+        [(id, skor)] döndürür; sonuç tüm POI'lerin skora göre sıralanmasıyla aynıdır.
+        k kayıtlı K değerinden büyük olamaz (ValueError).
+        """
+        if k > self.k:
+            raise ValueError(f"k={k} kayıtlı K değerinden ({self.k}) büyük olamaz")
+
+        layer = self.data['categories'].get(category)
+        if layer is None:
+            return []
+        if bbox is None:
+            return [(poi_id, score) for poi_id, score, _, _ in layer['top'][:k]]
+
+        west, south, east, north = bbox
+        min_x, min_y = lonlat_to_world(west, north)
+        max_x, max_y = lonlat_to_world(east, south)
+        bounds = (min_x, min_y, max_x, max_y)
+        tiles = [layer['tiles'][str(level)] for level in self.zooms]
+
+        position = self._start_level(bounds, zoom)
+        scale = 2 ** self.zooms[position]
+        lists = []
+        for tx in range(int(min_x * scale), int(max_x * scale) + 1):
+            for ty in range(int(min_y * scale), int(max_y * scale) + 1):
+                self._collect(tiles, bbox, bounds, position, tx, ty, k, lists)
+
+        # Skor eşitliğinde id'ye göre: build_top_lists ile aynı sıra
+        merged = heapq.merge(*lists, key=lambda e: (-e[1], e[0]))
+        return [(poi_id, score) for poi_id, score, _, _ in itertools.islice(merged, k)]
+
+
+def main():
+    print("=" * 70)
+    print("EN İYİ K LİSTELERİ")
+    print("=" * 70)
+
+    output = {
+        'version': 2,
+        'k': TOP_K,
+        'zooms': ZOOMS,
+        'prior_weight': PRIOR_WEIGHT,
+        'categories': {}
+    }
+
+    for category in CATEGORIES:
+        try:
+            pois = load_rated_pois(category, BASE_DIR)
+        except Exception as e:
+            print(f"✗ {category}: HATA - {str(e)}")
+            continue
+
+        top, tiles, prior_mean = build_top_lists(pois, ZOOMS, TOP_K, PRIOR_MEAN, PRIOR_WEIGHT)
+        output['categories'][category] = {
+            'prior_mean': round(prior_mean, 4),
+            'rated_count': len(pois),
+            'top': top,
+            'tiles': tiles
+        }
+        tile_count = sum(len(level) for level in tiles.values())
+        print(f"✓ {category}: {len(pois)} puanlı POI, önsel ortalama {prior_mean:.2f}, {tile_count} karo")
+
+    output_path = os.path.join(BASE_DIR, OUTPUT_FILE)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False)
+    print(f"\n💾 Sonuçlar kaydedildi: {output_path}")
+
+    print("\n" + "=" * 70)
+    print("✓ İŞLEM TAMAMLANDI!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
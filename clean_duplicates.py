@@ -5,11 +5,12 @@ Duplike POI'leri Temizleme
 """
 
 import json
-import math
 import re
 from collections import defaultdict
 from difflib import SequenceMatcher
 
+from spatial_index import GridIndex
+
 # Dosya yolları
 BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
 
@@ -52,23 +53,6 @@ def is_similar_name(name1, name2, threshold=0.85):
     similarity = SequenceMatcher(None, norm1, norm2).ratio()
     return similarity >= threshold
 
-def haversine_distance(coord1, coord2):
-    """İki koordinat arasındaki mesafeyi metre cinsinden hesaplar"""
-    lon1, lat1 = coord1
-    lon2, lat2 = coord2
-    
-    R = 6371.0
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    dlon = math.radians(lon2 - lon1)
-    dlat = math.radians(lat2 - lat1)
-    
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    distance = R * c * 1000
-    return distance
-
 def load_geojson(category):
     """GeoJSON dosyasını yükle"""
     filepath = f"{BASE_DIR}\\{category}.geojson"
@@ -86,6 +70,12 @@ def find_duplicates_in_category(features, category_name):
     duplicates = []
     checked = set()
     
+    # 15 metrelik grid indeks: sadece komşu hücrelerdeki feature'lar karşılaştırılır
+    index = GridIndex(15)
+    for i, feat in enumerate(features):
+        lon, lat = feat['geometry']['coordinates'][:2]
+        index.insert(i, lon, lat)
+    
     for i, feat1 in enumerate(features):
         props1 = feat1['properties']
         coords1 = feat1['geometry']['coordinates']
@@ -95,21 +85,19 @@ def find_duplicates_in_category(features, category_name):
         if id1 in checked:
             continue
         
-        for j in range(i + 1, len(features)):
+        for j, distance in sorted(index.query_radius(coords1[0], coords1[1], 15)):
+            if j <= i:
+                continue
             feat2 = features[j]
             props2 = feat2['properties']
-            coords2 = feat2['geometry']['coordinates']
             id2 = props2.get('id', f'unknown_{j}')
             name2 = props2.get('name', '')
             
             if id2 in checked:
                 continue
             
-            # Mesafeyi hesapla
-            distance = haversine_distance(coords1, coords2)
-            
             # 15 metre içinde ve benzer isimde ise duplikat
-            if distance <= 15 and is_similar_name(name1, name2):
+            if is_similar_name(name1, name2):
                 duplicates.append({
                     'keep_index': i,  # İlkini tut
                     'remove_index': j,  # İkincisini sil
@@ -189,9 +177,9 @@ def main():
     if total_removed > 0:
         print("\n🔄 Yeni duplikat analizi yapılıyor...\n")
         
-        # Yeni analiz için komutu çalıştır
-        import subprocess
-        subprocess.run(['python', 'find_duplicates.py'], cwd=r'C:\Users\User\Desktop\vectormap')
+        # Kaydedilmiş indeks sayesinde sadece değişen POI'ler yeniden test edilir
+        from find_duplicates import main as analyze_close_pois
+        analyze_close_pois()
     else:
         print("\n✓ Temizlenecek duplikat bulunamadı!")
 
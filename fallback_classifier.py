@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kategorize Edilemeyen POI'ler İçin Yedek Sınıflandırıcı
+
+categorize_poi'nin None döndürdüğü (diger'e düşen) POI'ler, takılabilir bir
+sınıflandırıcı arayüzü üzerinden asyncio worker havuzunda sınıflandırılır.
+Sonuçlar normalize edilmiş (isim, kategori, alt kategori) anahtarıyla diskte
+önbelleğe alınır; tekrar çalıştırmalarda sadece yeni metinler sınıflandırılır.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+
+from clean_duplicates import normalize_name
+
+# Dosya yolları
+BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+CACHE_FILE = os.path.join(BASE_DIR, "fallback_cache.json")
+
+# Worker havuzu ayarları
+DEFAULT_CONCURRENCY = 8
+DEFAULT_QUEUE_SIZE = 64
+CACHE_FLUSH_EVERY = 200
+
+VALID_CATEGORIES = ['eglence', 'kultur-sanat', 'yemek', 'doga']
+
+# Dosyaları güncelleyecek gerçek backend (BaseClassifier örneği).
+# None ise main() KeywordClassifier ile sadece deneme çalışması yapar, dosya yazmaz.
+CLASSIFIER = None
+
+
+class BaseClassifier:
+    """Sınıflandırıcı arayüzü - backend'ler bunu implement eder"""
+
+    # Önbellek bu kimlikle etiketlenir; backend veya davranışı değişince önbellek geçersiz olur
+    name = 'base'
+    version = '1'
+
+    @property
+    def cache_id(self):
+        return f"{self.name}:{self.version}"
+
+    async def classify(self, name, category, subcategory):
+        """
+        Ana kategoriyi döndürür ('eglence', 'kultur-sanat', 'yemek', 'doga')
+        veya karar verilemezse None. Hata durumunda exception fırlatır.
+        """
+        raise NotImplementedError("classify() metodu implement edilmeli")
+
+
+class KeywordClassifier(BaseClassifier):
+    """
+    Yerel (test amaçlı) sınıflandırıcı.
+    Anahtar kelimeleri Türkçe karakterlerden arındırıp eşleştirir;
+    delay ile uzak bir backend'in gecikmesi simüle edilebilir.
+    """
+
+    name = 'keyword'
+
+    def __init__(self, category_mapping, delay=0.0):
+        self.delay = delay
+        self.keywords = {
+            main_cat: sorted({normalize_name(k) for k in keywords if normalize_name(k)})
+            for main_cat, keywords in category_mapping.items()
+        }
+        # Anahtar kelime listesi değişirse eski sonuçlar tekrar kullanılmasın
+        digest = hashlib.sha1(json.dumps(self.keywords, sort_keys=True).encode('utf-8'))
+        self.version = digest.hexdigest()[:12]
+
+    async def classify(self, name, category, subcategory):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        # Önce kategori/alt kategori, sonra isim
+        for text in (f"{category} {subcategory}", name):
+            words = f" {normalize_name(text)} "
+            for main_cat, keywords in self.keywords.items():
+                if any(f" {keyword} " in words for keyword in keywords):
+                    return main_cat
+        return None
+
+
+def make_cache_key(name, category, subcategory):
+    """Önbellek anahtarı: normalize edilmiş (isim, kategori, alt kategori)"""
+    return "|".join(normalize_name(part or '') for part in (name, category, subcategory))
+
+
+class ClassificationCache:
+    """
+    Diskte kalıcı sınıflandırma önbelleği (JSON).
+    Dosya, sonuçları üreten sınıflandırıcının kimliğini saklar; kimlik
+    değişmişse (başka backend veya sürüm) eski sonuçlar kullanılmaz.
+    path None ise önbellek sadece bellekte tutulur, diske yazılmaz.
+    """
+
+    def __init__(self, path=CACHE_FILE, classifier_id=None):
+        self.path = path
+        self.classifier_id = classifier_id
+        self.entries = {}
+        self.dirty = 0
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get('classifier') == classifier_id:
+                    self.entries = data.get('entries', {})
+                else:
+                    print("  - Önbellek başka bir sınıflandırıcıya ait, sıfırdan başlanıyor")
+                    self.dirty = 1
+            except Exception as e:
+                print(f"  - Önbellek okunamadı, sıfırdan başlanıyor: {str(e)}")
+                self.entries = {}
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries[key] = value
+        self.dirty += 1
+        if self.dirty >= CACHE_FLUSH_EVERY:
+            self.save()
+
+    def save(self):
+        """Önbelleği atomik olarak diske yaz"""
+        if self.path is None:
+            return
+        if not self.dirty and os.path.exists(self.path):
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'classifier': self.classifier_id, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = 0
+
+
+async def _worker(classifier, queue, cache, stats):
+    """Kuyruktan iş alıp sınıflandırıcıya gönderir"""
+    while True:
+        item = await queue.get()
+        if item is None:
+            queue.task_done()
+            return
+        key, props, future = item
+        try:
+            # Alan var ama null olabilir; backend'lere her zaman str verilir
+            result = await classifier.classify(
+                props.get('name') or '',
+                props.get('category') or '',
+                props.get('subcategory') or ''
+            )
+            if result not in VALID_CATEGORIES:
+                result = None
+            cache.set(key, result)
+            stats['classified'] += 1
+            future.set_result(result)
+        except Exception as e:
+            # Hatalar önbelleğe yazılmaz, bir sonraki çalıştırmada tekrar denenir
+            stats['errors'] += 1
+            print(f"  - HATA ({props.get('name') or 'İsimsiz'}): {str(e)}")
+            future.set_result(None)
+        finally:
+            queue.task_done()
+
+
+async def classify_features_async(features, classifier, cache,
+                                  concurrency=DEFAULT_CONCURRENCY,
+                                  queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Feature listesini sınıflandırır, her feature için kategori (veya None) döndürür.
+    Sınırlı kuyruk backpressure sağlar; aynı anahtar için tek istek yapılır.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    stats = {'cache_hits': 0, 'deduplicated': 0, 'classified': 0, 'errors': 0}
+    in_flight = {}
+    pending = []
+
+    workers = [
+        asyncio.create_task(_worker(classifier, queue, cache, stats))
+        for _ in range(max(1, concurrency))
+    ]
+
+    for feature in features:
+        props = feature['properties']
+        key = make_cache_key(props.get('name'), props.get('category'), props.get('subcategory'))
+
+        if key in cache:
+            stats['cache_hits'] += 1
+            pending.append(cache.get(key))
+        elif key in in_flight:
+            stats['deduplicated'] += 1
+            pending.append(in_flight[key])
+        else:
+            future = loop.create_future()
+            in_flight[key] = future
+            pending.append(future)
+            # Kuyruk doluysa burada bekler (backpressure)
+            await queue.put((key, props, future))
+
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    cache.save()
+
+    results = [
+        item.result() if isinstance(item, asyncio.Future) else item
+        for item in pending
+    ]
+    return results, stats
+
+
+def classify_features(features, classifier, cache_path=CACHE_FILE,
+                      concurrency=DEFAULT_CONCURRENCY):
+    """
+    Senkron kodun (process_poi_data) çağırması için sarmalayıcı.
+    cache_path None ise önbellek diske yazılmaz.
+    """
+    cache = ClassificationCache(cache_path, classifier.cache_id)
+    return asyncio.run(classify_features_async(features, classifier, cache, concurrency))
+
+
+def apply_fallback(uncategorized, classifier, cache_path=CACHE_FILE,
+                   concurrency=DEFAULT_CONCURRENCY):
+    """
+    Kategorize edilemeyen feature'ları sınıflandırır.
+    (yeni kategorize edilenler {kategori: [feature]}, hala kategorisizler) döndürür.
+    """
+    results, stats = classify_features(uncategorized, classifier, cache_path, concurrency)
+
+    recovered = {}
+    remaining = []
+    for feature, category in zip(uncategorized, results):
+        if category:
+            recovered.setdefault(category, []).append(feature)
+        else:
+            remaining.append(feature)
+
+    print(f"  - Önbellekten: {stats['cache_hits']}, tekrar eden: {stats['deduplicated']}, "
+          f"sınıflandırılan: {stats['classified']}, hata: {stats['errors']}")
+    print(f"  - Kurtarılan: {len(uncategorized) - len(remaining)} mekan")
+    return recovered, remaining
+
+
+def main():
+    from process_poi_data import CATEGORY_MAPPING
+
+    print("=" * 60)
+    print("YEDEK SINIFLANDIRICI (diger.geojson)")
+    print("=" * 60)
+
+    diger_path = os.path.join(BASE_DIR, "diger.geojson")
+    with open(diger_path, 'r', encoding='utf-8') as f:
+        diger = json.load(f)
+    features = diger.get('features', [])
+    print(f"\n{len(features)} kategorize edilemeyen POI yüklendi")
+
+    if CLASSIFIER is None:
+        print("\n⚠️  Backend atanmamış: yerel KeywordClassifier ile deneme çalışması (dosya yazılmaz)")
+        recovered, remaining = apply_fallback(
+            features, KeywordClassifier(CATEGORY_MAPPING), cache_path=None
+        )
+        for category, new_features in recovered.items():
+            examples = ", ".join(f['properties'].get('name') or '' for f in new_features[:3])
+            print(f"  - {category}: {len(new_features)} feature (ör. {examples})")
+        return
+
+    recovered, remaining = apply_fallback(features, CLASSIFIER)
+
+    for category, new_features in recovered.items():
+        output_file = os.path.join(BASE_DIR, f"{category}.geojson")
+        data = {"type": "FeatureCollection", "features": []}
+        if os.path.exists(output_file):
+            with open(output_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        data['features'].extend(new_features)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"  ✓ {category}: +{len(new_features)} feature")
+
+    diger['features'] = remaining
+    with open(diger_path, 'w', encoding='utf-8') as f:
+        json.dump(diger, f, ensure_ascii=False, indent=2)
+    print(f"  ✓ diger: {len(remaining)} feature kaldı")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,40 +5,23 @@ Koordinatları Birbirine Yakın POI'leri Bulma
 """
 
 import json
-import math
+import os
 from collections import defaultdict
 
+from spatial_index import GridIndex, haversine_distance
+
 # Dosya yolları
 BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+INDEX_FILE = os.path.join(BASE_DIR, "duplicate_index.json")
 
-def haversine_distance(coord1, coord2):
-    """İki koordinat arasındaki mesafeyi metre cinsinden hesaplar"""
-    lon1, lat1 = coord1
-    lon2, lat2 = coord2
-    
-    # Dünya yarıçapı (km)
-    R = 6371.0
-    
-    # Radyana çevir
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    dlon = math.radians(lon2 - lon1)
-    dlat = math.radians(lat2 - lat1)
-    
-    # Haversine formülü
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    distance = R * c * 1000  # metre cinsinden
-    return distance
-
-def load_all_pois():
+def load_all_pois(base_dir=BASE_DIR, categories=None):
     """Tüm kategorilerden POI'leri yükle"""
     all_pois = []
-    categories = ['eglence', 'kultur-sanat', 'yemek', 'doga', 'diger']
+    if categories is None:
+        categories = ['eglence', 'kultur-sanat', 'yemek', 'doga', 'diger']
     
     for category in categories:
-        filepath = f"{BASE_DIR}\\{category}.geojson"
+        filepath = os.path.join(base_dir, f"{category}.geojson")
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -71,12 +54,19 @@ def find_close_pois(pois, distance_threshold=10):
     close_pairs = []
     checked = set()
     
+    # Grid indeks: sadece komşu hücrelerdeki POI'ler karşılaştırılır
+    index = GridIndex(distance_threshold)
+    for i, poi in enumerate(pois):
+        index.insert(i, poi['lon'], poi['lat'])
+    
     total = len(pois)
     for i, poi1 in enumerate(pois):
         if (i + 1) % 1000 == 0:
             print(f"İlerleme: {i+1}/{total} POI kontrol edildi...")
         
-        for j in range(i + 1, total):
+        for j, distance in sorted(index.query_radius(poi1['lon'], poi1['lat'], distance_threshold)):
+            if j <= i:
+                continue
             poi2 = pois[j]
             
             # Aynı POI'yi atlama
@@ -84,21 +74,126 @@ def find_close_pois(pois, distance_threshold=10):
             if pair_key in checked:
                 continue
             
-            # Mesafeyi hesapla
-            distance = haversine_distance(
-                [poi1['lon'], poi1['lat']], 
-                [poi2['lon'], poi2['lat']]
-            )
-            
-            if distance <= distance_threshold:
-                close_pairs.append({
-                    'poi1': poi1,
-                    'poi2': poi2,
-                    'distance': distance,
-                    'same_name': poi1['name'].lower() == poi2['name'].lower(),
-                    'same_category': poi1['source_category'] == poi2['source_category']
-                })
-                checked.add(pair_key)
+            close_pairs.append(make_close_pair(poi1, poi2, distance))
+            checked.add(pair_key)
+    
+    return close_pairs
+
+def make_close_pair(poi1, poi2, distance):
+    """Yakın çift kaydı oluştur"""
+    return {
+        'poi1': poi1,
+        'poi2': poi2,
+        'distance': distance,
+        'same_name': poi1['name'].lower() == poi2['name'].lower(),
+        'same_category': poi1['source_category'] == poi2['source_category']
+    }
+
+def poi_index_keys(pois):
+    """Her POI için benzersiz indeks anahtarı (kategori/id, tekrar edenlere #n eklenir)"""
+    keys = []
+    seen = defaultdict(int)
+    for poi in pois:
+        base_key = f"{poi['source_category']}/{poi['id']}"
+        count = seen[base_key]
+        seen[base_key] += 1
+        keys.append(base_key if count == 0 else f"{base_key}#{count}")
+    return keys
+
+def load_index_state(state_path, distance_threshold):
+    """Kaydedilmiş indeksi yükle; yoksa veya eşik farklıysa boş durum döndür"""
+    if os.path.exists(state_path):
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('distance_threshold') == distance_threshold:
+                return {
+                    'index': GridIndex.from_dict(state['index']),
+                    'names': state['names'],
+                    'pairs': [tuple(pair) for pair in state['pairs']]
+                }
+            print("  - Mesafe eşiği değişmiş, indeks yeniden oluşturulacak")
+        except Exception as e:
+            print(f"  - İndeks okunamadı, yeniden oluşturulacak: {str(e)}")
+    
+    return {'index': GridIndex(distance_threshold), 'names': {}, 'pairs': []}
+
+def save_index_state(state_path, distance_threshold, state):
+    """İndeksi, normalize isimleri ve yakın çiftleri kaydet"""
+    data = {
+        'distance_threshold': distance_threshold,
+        'index': state['index'].to_dict(),
+        'names': state['names'],
+        'pairs': [list(pair) for pair in state['pairs']]
+    }
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+def find_close_pois_incremental(pois, distance_threshold=10, state_path=INDEX_FILE):
+    """
+    find_close_pois ile aynı sonucu verir, ancak kaydedilmiş indeks sayesinde
+    sadece yeni veya değişmiş POI'ler indekse karşı test edilir.
+    """
+    print(f"\n🔍 {distance_threshold} metre içindeki POI'ler aranıyor (artımlı)...\n")
+    
+    state = load_index_state(state_path, distance_threshold)
+    index = state['index']
+    names = state['names']
+    
+    keys = poi_index_keys(pois)
+    current = dict(zip(keys, pois))
+    
+    # Silinen veya değişen POI'leri indeksten çıkar
+    stale = set()
+    for key in list(names):
+        poi = current.get(key)
+        if (poi is None
+                or names[key] != [poi['name'].lower(), poi['category']]
+                or index.points.get(key) != (poi['lon'], poi['lat'])):
+            stale.add(key)
+    for key in stale:
+        if key in index:
+            index.remove(key)
+        del names[key]
+    pairs = [pair for pair in state['pairs'] if pair[0] not in stale and pair[1] not in stale]
+    
+    # Yeni veya değişen POI'leri indekse karşı test et ve ekle
+    new_keys = [key for key in keys if key not in names]
+    for key in new_keys:
+        poi = current[key]
+        for other, _ in index.query_radius(poi['lon'], poi['lat'], distance_threshold):
+            pairs.append((other, key))
+        index.insert(key, poi['lon'], poi['lat'])
+        names[key] = [poi['name'].lower(), poi['category']]
+    
+    print(f"  - Değişmeyen: {len(keys) - len(new_keys)}, yeni/değişen: {len(new_keys)}, "
+          f"silinen/değişen: {len(stale)} POI")
+    
+    state['pairs'] = pairs
+    save_index_state(state_path, distance_threshold, state)
+    
+    ordinal = {key: i for i, key in enumerate(keys)}
+    return assemble_close_pairs(pois, [(ordinal[a], ordinal[b]) for a, b in pairs])
+
+def assemble_close_pairs(pois, ordinal_pairs):
+    """
+    (i, j) sıra numarası çiftlerinden, find_close_pois ile aynı sırada
+    ve aynı id-çifti filtresiyle yakın çift listesi üret
+    """
+    ordered = sorted(set(tuple(sorted(pair)) for pair in ordinal_pairs))
+    
+    close_pairs = []
+    checked = set()
+    for i, j in ordered:
+        poi1, poi2 = pois[i], pois[j]
+        pair_key = tuple(sorted([poi1['id'], poi2['id']]))
+        if pair_key in checked:
+            continue
+        distance = haversine_distance([poi1['lon'], poi1['lat']], [poi2['lon'], poi2['lat']])
+        close_pairs.append(make_close_pair(poi1, poi2, distance))
+        checked.add(pair_key)
     
     return close_pairs
 
@@ -171,29 +266,12 @@ def analyze_duplicates(close_pairs):
     else:
         print("   ✓ Farklı kategorilerde aynı isimli POI bulunamadı")
 
-def main():
-    print("="*70)
-    print("YAKIN POI TESPİT ARACI")
-    print("="*70)
-    
-    # 1. Tüm POI'leri yükle
-    print("\n1. POI'ler yükleniyor...")
-    all_pois = load_all_pois()
-    print(f"\n✓ Toplam {len(all_pois)} POI yüklendi")
-    
-    # 2. Yakın POI'leri bul (10 metre içinde)
-    print("\n2. Yakın POI'ler aranıyor...")
-    close_pairs = find_close_pois(all_pois, distance_threshold=10)
-    
-    # 3. Analiz et
-    analyze_duplicates(close_pairs)
-    
-    # 4. Sonuçları kaydet
-    output_file = f"{BASE_DIR}\\duplicate_analysis.json"
+def save_duplicate_analysis(output_file, all_pois, close_pairs, distance_threshold=10):
+    """Yakın çift analizini JSON olarak kaydet"""
     result = {
         'total_pois': len(all_pois),
         'close_pairs_count': len(close_pairs),
-        'distance_threshold_meters': 10,
+        'distance_threshold_meters': distance_threshold,
         'close_pairs': [
             {
                 'poi1_id': p['poi1']['id'],
@@ -214,6 +292,27 @@ def main():
         json.dump(result, f, ensure_ascii=False, indent=2)
     
     print(f"\n💾 Detaylı sonuçlar kaydedildi: {output_file}")
+
+def main():
+    print("="*70)
+    print("YAKIN POI TESPİT ARACI")
+    print("="*70)
+    
+    # 1. Tüm POI'leri yükle
+    print("\n1. POI'ler yükleniyor...")
+    all_pois = load_all_pois()
+    print(f"\n✓ Toplam {len(all_pois)} POI yüklendi")
+    
+    # 2. Yakın POI'leri bul (10 metre içinde)
+    print("\n2. Yakın POI'ler aranıyor...")
+    close_pairs = find_close_pois_incremental(all_pois, distance_threshold=10)
+    
+    # 3. Analiz et
+    analyze_duplicates(close_pairs)
+    
+    # 4. Sonuçları kaydet
+    output_file = f"{BASE_DIR}\\duplicate_analysis.json"
+    save_duplicate_analysis(output_file, all_pois, close_pairs, distance_threshold=10)
     
     print("\n" + "="*70)
     print("✓ ANALİZ TAMAMLANDI!")
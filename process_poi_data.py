@@ -8,11 +8,20 @@ import json
 import os
 from collections import defaultdict
 
+from fallback_classifier import apply_fallback
+
 # Dosya yolları
 BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data"
 GEOJSON_DIR = os.path.join(BASE_DIR, "geojson")
 OUTPUT_DIR = GEOJSON_DIR
 
+# Kategorize edilemeyenler için yedek sınıflandırıcı (BaseClassifier örneği).
+# Varsayılan olarak kapalı; fallback_classifier.KeywordClassifier sadece test
+# amaçlı yerel bir yedektir, üretimde gerçek bir backend atanmalıdır.
+FALLBACK_CLASSIFIER = None
+FALLBACK_CACHE_FILE = os.path.join(OUTPUT_DIR, "fallback_cache.json")
+FALLBACK_CONCURRENCY = 8
+
 # Kategori eşleştirme haritası
 CATEGORY_MAPPING = {
     # Eğlence kategorisi
@@ -255,6 +264,18 @@ def main():
         else:
             uncategorized.append(feature)
     
+    # Yedek sınıflandırıcı ile kategorize edilemeyenleri kurtarmayı dene
+    if uncategorized and FALLBACK_CLASSIFIER is not None:
+        print("\n3b. Kategorize edilemeyenler yedek sınıflandırıcıya gönderiliyor...")
+        recovered, uncategorized = apply_fallback(
+            uncategorized,
+            FALLBACK_CLASSIFIER,
+            cache_path=FALLBACK_CACHE_FILE,
+            concurrency=FALLBACK_CONCURRENCY
+        )
+        for category, features in recovered.items():
+            categorized[category].extend(features)
+    
     # İstatistikleri göster
     print("\nKategori İstatistikleri:")
     for cat in ['eglence', 'kultur-sanat', 'yemek', 'doga']:
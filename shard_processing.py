@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coğrafi Parçalama (Sharding) ile Şehir Ölçeğinde Yakın POI Tespiti
+
+POI'ler sabit boyutlu karolara veya ilce_sinir.geojson'daki ilçe
+poligonlarına bölünür. Her parça, sınırı aşan çiftlerin kaçmaması için
+tespit yarıçapı kadar bir "halo" ile birlikte ayrı bir süreçte işlenir.
+Parça sonuçları birleştirildiğinde tek parçalı çalıştırmayla aynı çıktı elde edilir.
+"""
+
+import json
+import math
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from find_duplicates import (analyze_duplicates, assemble_close_pairs,
+                             load_all_pois, save_duplicate_analysis)
+from spatial_index import GridIndex, search_box_degrees
+
+# Dosya yolları
+BASE_DIR = r"C:\Users\User\Desktop\vectormap\public\data\geojson"
+DISTRICTS_FILE = r"C:\Users\User\Desktop\vectormap\ilce_sinir.geojson"
+
+# Parçalama ayarları
+SHARD_MODE = 'tile'  # 'tile' (karolar) veya 'district' (ilçe poligonları)
+DEFAULT_TILE_SIZE_M = 2000
+OUTSIDE_SHARD = '_disari'
+
+# EPSG:5254 (TUREF / TM30) - GRS80 elipsoidi üzerinde Transverse Mercator
+TM30_PARAMS = {
+    'a': 6378137.0,
+    'f': 1 / 298.257222101,
+    'lon0': 30.0,
+    'k0': 1.0,
+    'false_easting': 500000.0,
+    'false_northing': 0.0
+}
+
+
+def tm_to_lonlat(x, y, params=TM30_PARAMS):
+    """Transverse Mercator (x, y) koordinatını (boylam, enlem) dereceye çevirir"""
+    a, f, k0 = params['a'], params['f'], params['k0']
+    e2 = f * (2 - f)
+    ep2 = e2 / (1 - e2)
+
+    m = (y - params['false_northing']) / k0
+    mu = m / (a * (1 - e2 / 4 - 3 * e2**2 / 64 - 5 * e2**3 / 256))
+    e1 = (1 - math.sqrt(1 - e2)) / (1 + math.sqrt(1 - e2))
+    phi1 = (mu
+            + (3 * e1 / 2 - 27 * e1**3 / 32) * math.sin(2 * mu)
+            + (21 * e1**2 / 16 - 55 * e1**4 / 32) * math.sin(4 * mu)
+            + (151 * e1**3 / 96) * math.sin(6 * mu)
+            + (1097 * e1**4 / 512) * math.sin(8 * mu))
+
+    sin_phi1 = math.sin(phi1)
+    cos_phi1 = math.cos(phi1)
+    tan_phi1 = math.tan(phi1)
+    c1 = ep2 * cos_phi1**2
+    t1 = tan_phi1**2
+    n1 = a / math.sqrt(1 - e2 * sin_phi1**2)
+    r1 = a * (1 - e2) / (1 - e2 * sin_phi1**2)**1.5
+    d = (x - params['false_easting']) / (n1 * k0)
+
+    lat = phi1 - (n1 * tan_phi1 / r1) * (
+        d**2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1**2 - 9 * ep2) * d**4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1**2 - 252 * ep2 - 3 * c1**2) * d**6 / 720
+    )
+    lon = (d
+           - (1 + 2 * t1 + c1) * d**3 / 6
+           + (5 - 2 * c1 + 28 * t1 - 3 * c1**2 + 8 * ep2 + 24 * t1**2) * d**5 / 120) / cos_phi1
+
+    return params['lon0'] + math.degrees(lon), math.degrees(lat)
+
+
+def load_districts(filepath=DISTRICTS_FILE):
+    """
+    İlçe poligonlarını yükler, gerekirse WGS84'e çevirir.
+    [(ilçe adı, [poligon halkaları listesi], bbox)] döndürür.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    crs_name = data.get('crs', {}).get('properties', {}).get('name', '')
+    projected = crs_name.endswith('5254')
+
+    districts = []
+    for feature in data.get('features', []):
+        geometry = feature['geometry']
+        polygons = geometry['coordinates']
+        if geometry['type'] == 'Polygon':
+            polygons = [polygons]
+
+        rings_list = []
+        for polygon in polygons:
+            rings = []
+            for ring in polygon:
+                if projected:
+                    ring = [tm_to_lonlat(x, y) for x, y in ring]
+                rings.append([tuple(point[:2]) for point in ring])
+            rings_list.append(rings)
+
+        all_points = [point for rings in rings_list for point in rings[0]]
+        bbox = (
+            min(p[0] for p in all_points), min(p[1] for p in all_points),
+            max(p[0] for p in all_points), max(p[1] for p in all_points)
+        )
+        name = feature['properties'].get('ad') or str(feature['properties'].get('OBJECTID'))
+        districts.append((name, rings_list, bbox))
+
+    return districts
+
+
+def _tile_buckets(pois, tile_size_m):
+    """POI sıra numaralarını karolara dağıtır: {karo: [sıra no]}"""
+    grid = GridIndex(tile_size_m)
+    buckets = defaultdict(list)
+    for i, poi in enumerate(pois):
+        buckets[grid.cell_of(poi['lon'], poi['lat'])].append(i)
+    return buckets
+
+
+def build_shards(pois, owners, radius_m):
+    """
+    Sahiplik bilgisinden parçaları kurar.
+    {parça: (çekirdek sıra no listesi, halo sıra no listesi)} döndürür.
+
+    Sahipler yarıçap boyutlu hücrelere dağıtılır; bir POI, yarıçap kutusunun
+    değdiği hücrelerde çekirdeği olan diğer parçaların halosuna eklenir.
+    Böylece halo parça karolarının değil, tespit yarıçapının genişliğindedir.
+    Kutu GridIndex sorgularıyla aynı search_box_degrees hesabını kullandığından,
+    indeksin bulacağı hiçbir sınır-ötesi çift kaçmaz.
+    """
+    grid = GridIndex(radius_m)
+    cell_owners = defaultdict(set)
+    for i, poi in enumerate(pois):
+        cell_owners[grid.cell_of(poi['lon'], poi['lat'])].add(owners[i])
+
+    shards = defaultdict(lambda: ([], []))
+    for i, poi in enumerate(pois):
+        lon, lat = poi['lon'], poi['lat']
+        owner = owners[i]
+        shards[owner][0].append(i)
+
+        dlon, dlat = search_box_degrees(lat, radius_m)
+        min_cx, min_cy = grid.cell_of(lon - dlon, lat - dlat)
+        max_cx, max_cy = grid.cell_of(lon + dlon, lat + dlat)
+        neighbors = set()
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                neighbors.update(cell_owners.get((cx, cy), ()))
+        neighbors.discard(owner)
+        for other in neighbors:
+            shards[other][1].append(i)
+
+    return dict(shards)
+
+
+# Süreç havuzundaki her worker'a bir kez aktarılan ilçe poligonları
+_WORKER_DISTRICTS = None
+
+
+def _init_worker(districts):
+    global _WORKER_DISTRICTS
+    _WORKER_DISTRICTS = districts
+
+
+def _ring_edges(ring):
+    """Halkanın kenarları: [((xi, yi), (xj, yj))]"""
+    return [(ring[i], ring[i - 1]) for i in range(len(ring))]
+
+
+def _clip_edges(edges, min_lon, min_lat, max_lat):
+    """
+    Kutudaki noktalardan doğuya giden ışınların kesebileceği kenarlar.
+    Diğer kenarlar hiçbir noktanın tek/çift sayımını değiştirmez.
+    """
+    return [
+        ((xi, yi), (xj, yj)) for (xi, yi), (xj, yj) in edges
+        if max(yi, yj) > min_lat and min(yi, yj) <= max_lat and max(xi, xj) > min_lon
+    ]
+
+
+def _point_in_edges(lon, lat, edges):
+    """Ray casting ile noktanın (süzülmüş kenarlarla verilen) halka içinde olup olmadığı"""
+    inside = False
+    for (xi, yi), (xj, yj) in edges:
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+    return inside
+
+
+def _assign_districts(points):
+    """
+    Bir karodaki noktaları ilçelere atar (ayrı süreçte çalışır).
+    Sadece sınır kutusu karoyla kesişen ilçeler test edilir; halkaların
+    kenarları da karonun kutusuna göre bir kez süzülür.
+    """
+    min_lon = min(lon for _, lon, _ in points)
+    max_lon = max(lon for _, lon, _ in points)
+    min_lat = min(lat for _, _, lat in points)
+    max_lat = max(lat for _, _, lat in points)
+
+    candidates = []
+    for name, rings_list, bbox in _WORKER_DISTRICTS:
+        if bbox[0] > max_lon or bbox[2] < min_lon or bbox[1] > max_lat or bbox[3] < min_lat:
+            continue
+        polygons = [
+            [_clip_edges(_ring_edges(ring), min_lon, min_lat, max_lat) for ring in rings]
+            for rings in rings_list
+        ]
+        candidates.append((name, polygons, bbox))
+
+    assigned = []
+    for i, lon, lat in points:
+        owner = OUTSIDE_SHARD
+        for name, polygons, bbox in candidates:
+            if not (bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]):
+                continue
+            if any(_point_in_edges(lon, lat, rings[0]) and not any(
+                    _point_in_edges(lon, lat, hole) for hole in rings[1:])
+                   for rings in polygons):
+                owner = name
+                break
+        assigned.append((i, owner))
+    return assigned
+
+
+def _process_shard(task):
+    """
+    Bir parçayı işler (ayrı süreçte çalışır).
+    Çekirdek a için a < b olan çiftler tutulur; böylece her çift
+    küçük sıra numaralı POI'nin sahibi olan parçada tam bir kez bulunur.
+    """
+    name, core, members, radius_m = task
+    index = GridIndex(radius_m)
+    for i, lon, lat in members:
+        index.insert(i, lon, lat)
+
+    pairs = []
+    for i, lon, lat in core:
+        for j, _ in index.query_radius(lon, lat, radius_m):
+            if j > i:
+                pairs.append((i, j))
+    return name, len(core), len(members), pairs
+
+
+def find_close_pois_sharded(pois, distance_threshold=10, mode='tile', districts=None,
+                            tile_size_m=DEFAULT_TILE_SIZE_M, workers=None):
+    """
+    find_close_pois ile aynı sonucu, parçaları süreç havuzunda işleyerek üretir.
+    mode: 'tile' (karolar) veya 'district' (ilçe poligonları)
+    District modunda da POI'ler önce karolara dağıtılır; poligon testleri
+    karo başına havuzda yapılır, ana süreç sadece hafif dağıtım işini yapar.
+    """
+    if mode == 'district' and districts is None:
+        districts = load_districts()
+
+    print(f"\n🔍 {distance_threshold} metre içindeki POI'ler parçalı olarak aranıyor ({mode})...\n")
+
+    buckets = _tile_buckets(pois, tile_size_m)
+
+    ordinal_pairs = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(districts,)) as executor:
+        owners = [None] * len(pois)
+        if mode == 'district':
+            # Poligon testleri karo karo havuzda yapılır; kenar süzme maliyeti
+            # küçük karolarda katlanmasın diye atama varsayılan karo boyutuyla yapılır
+            assign_buckets = buckets
+            if tile_size_m < DEFAULT_TILE_SIZE_M:
+                assign_buckets = _tile_buckets(pois, DEFAULT_TILE_SIZE_M)
+            chunks = [
+                [(i, pois[i]['lon'], pois[i]['lat']) for i in members]
+                for members in assign_buckets.values()
+            ]
+            for assigned in executor.map(_assign_districts, chunks):
+                for i, owner in assigned:
+                    owners[i] = owner
+        else:
+            for (tx, ty), members in buckets.items():
+                for i in members:
+                    owners[i] = f"karo_{tx}_{ty}"
+
+        shards = build_shards(pois, owners, distance_threshold)
+
+        tasks = []
+        for name, (core, halo) in shards.items():
+            core_points = [(i, pois[i]['lon'], pois[i]['lat']) for i in core]
+            halo_points = [(i, pois[i]['lon'], pois[i]['lat']) for i in halo]
+            tasks.append((name, core_points, core_points + halo_points, distance_threshold))
+
+        # Büyük parçalar önce: havuzun sonunda tek bir uzun iş kalmasın
+        tasks.sort(key=lambda task: len(task[2]), reverse=True)
+
+        for name, core_count, member_count, pairs in executor.map(_process_shard, tasks):
+            ordinal_pairs.extend(pairs)
+            if mode == 'district':
+                print(f"  ✓ {name}: {core_count} POI (+{member_count - core_count} halo), {len(pairs)} çift")
+
+    print(f"  - {len(shards)} parça işlendi")
+    return assemble_close_pairs(pois, ordinal_pairs)
+
+
+def main():
+    print("=" * 70)
+    print("PARÇALI YAKIN POI TESPİTİ")
+    print("=" * 70)
+
+    print("\n1. POI'ler yükleniyor...")
+    all_pois = load_all_pois()
+    print(f"\n✓ Toplam {len(all_pois)} POI yüklendi")
+
+    print("\n2. Yakın POI'ler aranıyor...")
+    close_pairs = find_close_pois_sharded(all_pois, distance_threshold=10, mode=SHARD_MODE)
+
+    analyze_duplicates(close_pairs)
+
+    output_file = f"{BASE_DIR}\\duplicate_analysis.json"
+    save_duplicate_analysis(output_file, all_pois, close_pairs, distance_threshold=10)
+
+    print("\n" + "=" * 70)
+    print("✓ ANALİZ TAMAMLANDI!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
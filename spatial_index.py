@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+POI'ler İçin Grid Tabanlı Mekansal İndeks
+"""
+
+import math
+from collections import defaultdict
+
+# haversine_distance ile aynı küre yarıçapı; derece/metre dönüşümü buradan türetilir
+EARTH_RADIUS_KM = 6371.0
+EARTH_RADIUS_M = EARTH_RADIUS_KM * 1000
+METERS_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180
+
+# Kayan nokta yuvarlamasına karşı arama kutusuna küçük bir pay
+SEARCH_BOX_PADDING = 1 + 1e-9
+
+
+def haversine_distance(coord1, coord2):
+    """İki koordinat arasındaki mesafeyi metre cinsinden hesaplar"""
+    lon1, lat1 = coord1
+    lon2, lat2 = coord2
+    
+    # Dünya yarıçapı (km)
+    R = EARTH_RADIUS_KM
+    
+    # Radyana çevir
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlon = math.radians(lon2 - lon1)
+    dlat = math.radians(lat2 - lat1)
+    
+    # Haversine formülü
+    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    
+    distance = R * c * 1000  # metre cinsinden
+    return distance
+
+
+def search_box_degrees(lat, radius_m):
+    """
+    Verilen enlemdeki noktadan radius_m içindeki tüm noktaları kapsayan
+    (boylam, enlem) derece payları. Kutu, haversine_distance ile tutarlıdır.
+    """
+    dlat = radius_m * SEARCH_BOX_PADDING / METERS_PER_DEGREE
+    # Boylam aralığı kutuptan uzak kenarda en geniştir
+    edge_lat = min(abs(lat) + dlat, 89.0)
+    dlon = radius_m * SEARCH_BOX_PADDING / (METERS_PER_DEGREE * math.cos(math.radians(edge_lat)))
+    return dlon, dlat
+
+
+class GridIndex:
+    """
+    Koordinatları sabit boyutlu hücrelere dağıtan basit mekansal indeks.
+    Yarıçap sorguları sadece ilgili hücrelere bakar; tüm çiftleri taramaz.
+    """
+
+    def __init__(self, cell_size_m, ref_lat=41.0):
+        self.cell_size_m = cell_size_m
+        self.ref_lat = ref_lat
+        self.cell_lat = cell_size_m / METERS_PER_DEGREE
+        self.cell_lon = cell_size_m / (METERS_PER_DEGREE * math.cos(math.radians(ref_lat)))
+        self.cells = defaultdict(list)
+        self.points = {}
+
+    def cell_of(self, lon, lat):
+        """Koordinatın düştüğü hücre"""
+        return (math.floor(lon / self.cell_lon), math.floor(lat / self.cell_lat))
+
+    def insert(self, key, lon, lat):
+        """Noktayı indekse ekle"""
+        self.points[key] = (lon, lat)
+        self.cells[self.cell_of(lon, lat)].append(key)
+
+    def remove(self, key):
+        """Noktayı indeksten çıkar"""
+        lon, lat = self.points.pop(key)
+        bucket = self.cells[self.cell_of(lon, lat)]
+        bucket.remove(key)
+        if not bucket:
+            del self.cells[self.cell_of(lon, lat)]
+
+    def __contains__(self, key):
+        return key in self.points
+
+    def __len__(self):
+        return len(self.points)
+
+    def candidates(self, lon, lat, radius_m):
+        """Yarıçapı kapsayan hücrelerdeki tüm anahtarlar (mesafe kontrolü yok)"""
+        dlon, dlat = search_box_degrees(lat, radius_m)
+        min_cx, min_cy = self.cell_of(lon - dlon, lat - dlat)
+        max_cx, max_cy = self.cell_of(lon + dlon, lat + dlat)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query_radius(self, lon, lat, radius_m):
+        """Yarıçap içindeki (anahtar, mesafe) çiftleri"""
+        results = []
+        for key in self.candidates(lon, lat, radius_m):
+            distance = haversine_distance([lon, lat], self.points[key])
+            if distance <= radius_m:
+                results.append((key, distance))
+        return results
+
+    def to_dict(self):
+        """JSON olarak kaydedilebilir form"""
+        return {
+            'cell_size_m': self.cell_size_m,
+            'ref_lat': self.ref_lat,
+            'points': {str(key): list(coords) for key, coords in self.points.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict çıktısından indeksi yeniden kur"""
+        index = cls(data['cell_size_m'], data.get('ref_lat', 41.0))
+        for key, (lon, lat) in data['points'].items():
+            index.insert(key, lon, lat)
+        return index
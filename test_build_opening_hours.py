@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+build_opening_hours.parse_opening_hours için regresyon testleri
+"""
+
+from build_opening_hours import STATUS_PARSED, STATUS_UNPARSEABLE, parse_opening_hours, time_window_mask
+
+
+def test_hour_24_only_with_zero_minutes():
+    bits, status = parse_opening_hours("18:00-24:00")
+    assert status == STATUS_PARSED
+    assert bits & time_window_mask(0, 23 * 60 + 50)
+    assert not bits & time_window_mask(1, 0)
+
+    for text in ("18:00-24:30", "24:15-02:00"):
+        assert parse_opening_hours(text) == (0, STATUS_UNPARSEABLE)
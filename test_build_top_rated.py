@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+build_top_rated.TopRatedIndex için regresyon testleri
+"""
+
+import random
+
+import pytest
+
+from build_top_rated import TOP_K, ZOOMS, TopRatedIndex, bayesian_score, build_top_lists
+
+
+def _index_and_ranking(count=5000, seed=9):
+    rng = random.Random(seed)
+    pois = [
+        {
+            'id': str(i),
+            'lon': rng.uniform(28.95, 29.1),
+            'lat': rng.uniform(40.98, 41.06),
+            'rating': round(rng.uniform(1, 5), 1),
+            'reviews_count': rng.randint(0, 500)
+        }
+        for i in range(count)
+    ]
+    top, tiles, prior_mean = build_top_lists(pois)
+    index = TopRatedIndex({'k': TOP_K, 'zooms': ZOOMS, 'categories': {'yemek': {'top': top, 'tiles': tiles}}})
+
+    ranking = sorted(
+        (
+            (round(bayesian_score(poi['rating'], poi['reviews_count'], prior_mean), 4),
+             poi['id'], poi['lon'], poi['lat'])
+            for poi in pois
+        ),
+        key=lambda e: (-e[0], e[1])
+    )
+    return index, ranking
+
+
+def test_viewport_top_matches_brute_force():
+    index, ranking = _index_and_ranking()
+    rng = random.Random(1)
+    for _ in range(200):
+        west, south = rng.uniform(28.94, 29.1), rng.uniform(40.97, 41.06)
+        size = 10 ** rng.uniform(-3, -1)
+        bbox = (west, south, west + size, south + size)
+        zoom = rng.choice([None, 11, 12, 14, 16, 18])
+        k = rng.choice([1, 10, TOP_K])
+
+        expected = [
+            (poi_id, score) for score, poi_id, lon, lat in ranking
+            if bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]
+        ][:k]
+        assert index.top('yemek', bbox, zoom, k) == expected
+
+
+def test_k_above_stored_limit_is_rejected():
+    index, _ = _index_and_ranking(count=10)
+    with pytest.raises(ValueError):
+        index.top('yemek', k=TOP_K + 1)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+shard_processing için regresyon testleri
+"""
+
+import math
+import random
+
+from find_duplicates import find_close_pois
+from shard_processing import DEFAULT_TILE_SIZE_M, build_shards, find_close_pois_sharded
+from spatial_index import METERS_PER_DEGREE
+
+
+def _random_pois(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        {
+            'id': str(i),
+            'name': f"poi {i}",
+            'category': 'yemek',
+            'source_category': 'yemek',
+            'lon': 29.0 + rng.uniform(0, 0.02),
+            'lat': 41.0 + rng.uniform(0, 0.02),
+            'properties': {}
+        }
+        for i in range(count)
+    ]
+
+
+def _pair_ids(pairs):
+    return sorted(tuple(sorted((pair['poi1']['id'], pair['poi2']['id']))) for pair in pairs)
+
+
+def test_sharded_matches_unsharded():
+    pois = _random_pois(1500)
+    # İlçe sınırı POI'lerin ortasından geçer, bir kısım POI hiçbir ilçede değil
+    square = [(29.005, 41.005), (29.015, 41.005), (29.015, 41.015), (29.005, 41.015), (29.005, 41.005)]
+    districts = [('merkez', [[square]], (29.005, 41.005, 29.015, 41.015))]
+
+    expected = _pair_ids(find_close_pois(pois, 50))
+    assert expected
+    for mode, tile_size_m in (('tile', 300), ('tile', 40), ('district', DEFAULT_TILE_SIZE_M)):
+        found = find_close_pois_sharded(pois, 50, mode=mode, districts=districts,
+                                        tile_size_m=tile_size_m, workers=2)
+        assert _pair_ids(found) == expected
+
+
+def test_halo_is_radius_wide():
+    pois = _random_pois(3000)
+    border_lon = 29.01
+    owners = ['bati' if poi['lon'] < border_lon else 'dogu' for poi in pois]
+    radius = 10
+
+    shards = build_shards(pois, owners, radius)
+    lon_meters = METERS_PER_DEGREE * math.cos(math.radians(41.02))
+    for core, halo in shards.values():
+        # Halo, karo boyutundan bağımsız olarak sınırın birkaç yarıçap yakınındaki POI'lerden oluşur
+        for i in halo:
+            assert abs(pois[i]['lon'] - border_lon) * lon_meters <= 3 * radius
+        assert len(halo) < len(core) // 20
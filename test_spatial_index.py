@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+spatial_index.GridIndex için regresyon testleri
+"""
+
+import math
+import random
+
+from spatial_index import METERS_PER_DEGREE, GridIndex, haversine_distance
+
+
+def _just_across_cell_edge(index, radius_m):
+    """Sorgu noktasını hücre kenarının hemen altına, komşuyu radius_m'nin hemen içine koy"""
+    edge_cy = math.floor(41.0 / index.cell_lat) + 1
+    query_lat = edge_cy * index.cell_lat - 1e-9
+    other_lat = query_lat + (radius_m - 0.005) / METERS_PER_DEGREE
+    return query_lat, other_lat
+
+
+def test_pair_at_threshold_across_cell_boundary():
+    index = GridIndex(10)
+    lon = 29.0
+    query_lat, other_lat = _just_across_cell_edge(index, 10)
+    index.insert('komsu', lon, other_lat)
+
+    distance = haversine_distance([lon, query_lat], [lon, other_lat])
+    assert 9.99 < distance <= 10
+    assert index.cell_of(lon, query_lat)[1] != index.cell_of(lon, other_lat)[1]
+    assert [key for key, _ in index.query_radius(lon, query_lat, 10)] == ['komsu']
+
+
+def test_query_radius_matches_brute_force_near_threshold():
+    rng = random.Random(7)
+    radius = 10
+    index = GridIndex(radius)
+    center_lon, center_lat = 29.03, 41.02
+    points = {}
+    for i in range(3000):
+        # Çoğu nokta eşiğe çok yakın mesafede
+        bearing = rng.uniform(0, 2 * math.pi)
+        dist = radius + rng.uniform(-0.02, 0.02)
+        lat = center_lat + dist * math.cos(bearing) / METERS_PER_DEGREE
+        lon = center_lon + dist * math.sin(bearing) / (
+            METERS_PER_DEGREE * math.cos(math.radians(center_lat)))
+        points[i] = (lon, lat)
+        index.insert(i, lon, lat)
+
+    for query in rng.sample(list(points), 200):
+        qlon, qlat = points[query]
+        expected = sorted(
+            key for key, (lon, lat) in points.items()
+            if haversine_distance([qlon, qlat], [lon, lat]) <= radius
+        )
+        found = sorted(key for key, _ in index.query_radius(qlon, qlat, radius))
+        assert found == expected